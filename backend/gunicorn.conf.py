@@ -0,0 +1,12 @@
+import os
+
+# A single worker process so there is one shared model and one batching
+# worker thread; gthread gives concurrent request arrival and releases the
+# GIL inside TF ops, which is what lets the /predict batcher coalesce
+# requests into larger forward passes. The app is deliberately not
+# preloaded: the batch-worker thread (started at import) and TF state
+# would not survive the master's fork().
+workers = 1
+worker_class = "gthread"
+threads = int(os.getenv("THREADS", 8))
+bind = os.getenv("BIND", "0.0.0.0:5000")
@@ -1,57 +1,91 @@
 import tensorflow as tf
-from tensorflow.keras.preprocessing.image import ImageDataGenerator
-from tensorflow.keras import layers, models
+from tensorflow.keras import layers, models, mixed_precision
 from sklearn.utils import class_weight
 import numpy as np
 import os
 import json
 
+# FP16 compute on Tensor Cores / FP16 NEON; weights stay FP32 for stable
+# training and the softmax is cast back to float32 below
+mixed_precision.set_global_policy('mixed_float16')
+
 IMG_SIZE = 224
 BATCH_SIZE = 32
 EPOCHS = 30  
 DATA_DIR = "data" 
 
-datagen = ImageDataGenerator(
-    rescale=1./255,
-    validation_split=0.2,
-    rotation_range=30,
-    zoom_range=0.2,
-    horizontal_flip=True
-)
+# tf.data pipeline instead of the GIL-bound ImageDataGenerator: decode and
+# augmentation run on C++ threads and overlap with training via prefetch
+AUTOTUNE = tf.data.AUTOTUNE
 
-train_generator = datagen.flow_from_directory(
+train_ds = tf.keras.utils.image_dataset_from_directory(
     DATA_DIR,
-    target_size=(IMG_SIZE, IMG_SIZE),
-    batch_size=BATCH_SIZE,
-    class_mode='categorical',
+    validation_split=0.2,
     subset='training',
-    shuffle=True
+    seed=42,
+    image_size=(IMG_SIZE, IMG_SIZE),
+    batch_size=BATCH_SIZE,
+    label_mode='categorical'
 )
 
-val_generator = datagen.flow_from_directory(
+# Both calls must shuffle the file listing with the same seed: the split is
+# a slice of the (optionally shuffled) listing, so differing shuffle flags
+# would make the two subsets overlap
+val_ds = tf.keras.utils.image_dataset_from_directory(
     DATA_DIR,
-    target_size=(IMG_SIZE, IMG_SIZE),
-    batch_size=BATCH_SIZE,
-    class_mode='categorical',
+    validation_split=0.2,
     subset='validation',
-    shuffle=False
+    seed=42,
+    image_size=(IMG_SIZE, IMG_SIZE),
+    batch_size=BATCH_SIZE,
+    label_mode='categorical'
 )
 
 # Save class indices for decoding later
-class_indices = train_generator.class_indices
+class_indices = {name: i for i, name in enumerate(train_ds.class_names)}
+num_classes = len(class_indices)
 with open("class_indices.json", "w") as f:
     json.dump(class_indices, f)
 print("✅ Class indices:", class_indices)
 
-# Compute class weights to handle imbalance
+# Compute class weights to handle imbalance (labels come from the directory
+# names, so no need to decode any images here)
+labels = np.array([
+    class_indices[os.path.basename(os.path.dirname(p))]
+    for p in train_ds.file_paths
+])
 class_weights = class_weight.compute_class_weight(
     class_weight='balanced',
-    classes=np.unique(train_generator.classes),
-    y=train_generator.classes
+    classes=np.unique(labels),
+    y=labels
 )
 class_weights = dict(enumerate(class_weights))
 print("✅ Computed class weights:", class_weights)
 
+# Same rescale + augmentations as before, now vectorized per batch. The
+# model keeps consuming [0,1] inputs so the serving preprocessing (and the
+# int8 calibration below) stay unchanged.
+rescale = layers.Rescaling(1. / 255)
+augment = tf.keras.Sequential([
+    layers.RandomFlip('horizontal'),
+    layers.RandomRotation(30 / 360),
+    layers.RandomZoom(0.2)
+])
+
+train_ds = (
+    train_ds
+    .cache()
+    .map(lambda x, y: (augment(rescale(x), training=True), y),
+         num_parallel_calls=AUTOTUNE)
+    .prefetch(AUTOTUNE)
+)
+val_ds = (
+    val_ds
+    .map(lambda x, y: (rescale(x), y), num_parallel_calls=AUTOTUNE)
+    .cache()
+    .prefetch(AUTOTUNE)
+)
+
 base_model = tf.keras.applications.MobileNetV2(
     input_shape=(IMG_SIZE, IMG_SIZE, 3),
     include_top=False,
@@ -64,7 +98,7 @@ model = models.Sequential([
     layers.GlobalAveragePooling2D(),
     layers.Dense(128, activation='relu'),
     layers.Dropout(0.3),
-    layers.Dense(train_generator.num_classes, activation='softmax')
+    layers.Dense(num_classes, activation='softmax', dtype='float32')
 ])
 
 model.compile(optimizer='adam', loss='categorical_crossentropy', metrics=['accuracy'])
@@ -76,8 +110,8 @@ early_stop = tf.keras.callbacks.EarlyStopping(
 )
 
 history = model.fit(
-    train_generator,
-    validation_data=val_generator,
+    train_ds,
+    validation_data=val_ds,
     epochs=EPOCHS,
     class_weight=class_weights,
     callbacks=[early_stop]
@@ -86,3 +120,71 @@ history = model.fit(
 os.makedirs("models", exist_ok=True)
 model.save("models/maize_disease_model.h5")
 print("✅ Model saved to models/maize_disease_model.h5")
+
+# Back to float32 for the export section: under mixed_float16 the exported
+# graphs would carry fp16 compute and Cast ops, which the full-int8 TFLite
+# conversion below cannot quantize. Variables are stored fp32 either way,
+# so the trained weights transfer unchanged.
+mixed_precision.set_global_policy('float32')
+
+# Inference-only re-export: Dropout is a no-op at inference but still a
+# graph node, so rebuild the head without it (it holds no weights) and use
+# SavedModel format, which loads much faster than H5. The backbone must be
+# rebuilt too — a layer's dtype policy is fixed at construction, so reusing
+# base_model would keep the whole MobileNetV2 graph in fp16.
+inference_base = tf.keras.applications.MobileNetV2(
+    input_shape=(IMG_SIZE, IMG_SIZE, 3),
+    include_top=False,
+    weights=None
+)
+inference_model = models.Sequential([
+    inference_base,
+    layers.GlobalAveragePooling2D(),
+    layers.Dense(128, activation='relu'),
+    layers.Dense(num_classes, activation='softmax')
+])
+inference_model.set_weights(model.get_weights())
+inference_model.save("models/maize_savedmodel")
+print("✅ SavedModel saved to models/maize_savedmodel")
+
+# Head weights for the API's specialized classifier kernel: the fixed
+# 1280->128->4 matmul chain is cheap to run outside the TF graph
+w1, b1 = inference_model.layers[-2].get_weights()
+w2, b2 = inference_model.layers[-1].get_weights()
+np.savez("models/head_weights.npz", w1=w1, b1=b1, w2=w2, b2=b2)
+print("✅ Head weights saved to models/head_weights.npz")
+
+# One-shot TFLite export: XNNPACK's fused kernels make MobileNetV2 CPU
+# inference several times faster than the full TF runtime in the API
+converter = tf.lite.TFLiteConverter.from_keras_model(inference_model)
+converter.optimizations = [tf.lite.Optimize.DEFAULT]
+with open("models/maize.tflite", "wb") as f:
+    f.write(converter.convert())
+print("✅ TFLite model saved to models/maize.tflite")
+
+# Full-int8 quantization: 4x smaller weights/activations and int8 SIMD
+# kernels. Calibrated on validation images; uint8 input means the API can
+# feed raw pixels without the /255 normalization step.
+def representative_dataset():
+    for images, _ in val_ds.take(100):
+        yield [images[:1]]
+
+converter = tf.lite.TFLiteConverter.from_keras_model(inference_model)
+converter.optimizations = [tf.lite.Optimize.DEFAULT]
+converter.representative_dataset = representative_dataset
+converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+converter.inference_input_type = tf.uint8
+with open("models/maize_int8.tflite", "wb") as f:
+    f.write(converter.convert())
+print("✅ int8 TFLite model saved to models/maize_int8.tflite")
+
+# Optional ONNX export so the API can serve via onnxruntime (fused graphs,
+# much faster cold start than the full TF runtime)
+try:
+    import tf2onnx
+    spec = (tf.TensorSpec((None, IMG_SIZE, IMG_SIZE, 3), tf.float32, name="input"),)
+    tf2onnx.convert.from_keras(inference_model, input_signature=spec, opset=17,
+                               output_path="models/maize.onnx")
+    print("✅ ONNX model saved to models/maize.onnx")
+except ImportError:
+    print("ℹ️ tf2onnx not installed; skipping ONNX export")